@@ -1,25 +1,50 @@
 import os
-import uuid
+import io
+import orjson
+import hashlib
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi import FastAPI, HTTPException, Query, Request, File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, Field, field_validator
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import InsertOne, ReturnDocument
+from redis import asyncio as aioredis
+from bson import json_util
+from uuid6 import uuid7
 from dotenv import load_dotenv
 from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
+from reportlab.lib import colors, rl_accel
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import tempfile
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.pdfbase import pdfmetrics
+from reportlab import rl_config
+
+# ReportLab tuning: make sure the _rl_accel C extension is active (roughly
+# 35% faster PDF builds) and bias toward compressed binary streams;
+# invariant/verbose are pure overhead for a server that doesn't need
+# reproducible builds
+if not rl_accel._c_funcs:
+    print("Warning: reportlab _rl_accel C extension not available, PDF generation will be slower")
+rl_config.useA85 = 0
+rl_config.pageCompression = 1
+rl_config.invariant = 0
+rl_config.verbose = 0
+
+# Parse the metrics of the fonts the template uses once at import so the
+# first PDF request doesn't pay the lazy font load
+for _font_name in ('Helvetica', 'Helvetica-Bold'):
+    pdfmetrics.getFont(_font_name)
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
+# orjson is a C-extension JSON writer with native datetime support;
+# it serializes the list endpoint several times faster than stdlib json
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -35,20 +60,174 @@ MONGO_URL = os.environ.get('MONGO_URL')
 DB_NAME = os.environ.get('DB_NAME', 'havn_cube_db')
 
 if MONGO_URL:
-    client = AsyncIOMotorClient(MONGO_URL)
+    client = AsyncIOMotorClient(
+        MONGO_URL,
+        maxPoolSize=20,
+        minPoolSize=5,
+        serverSelectionTimeoutMS=3000,
+        connectTimeoutMS=2000,
+        waitQueueTimeoutMS=2000,
+        retryWrites=True,
+        # Compress BSON on the wire; the driver picks the first compressor
+        # both sides support (zstd via the zstandard package, zlib from
+        # the stdlib as fallback)
+        compressors="zstd,zlib",
+    )
     db = client[DB_NAME]
     estimates_collection = db.estimates
     clients_collection = db.clients
+    counters_collection = db.counters
 else:
     print("Warning: MONGO_URL not set")
     client = None
     db = None
     estimates_collection = None
     clients_collection = None
+    counters_collection = None
+
+# Redis connection (optional, used to cache generated PDFs)
+REDIS_URL = os.environ.get('REDIS_URL')
+PDF_CACHE_TTL = 3600  # seconds
+
+if REDIS_URL:
+    redis_client = aioredis.from_url(REDIS_URL)
+else:
+    print("Warning: REDIS_URL not set, PDF caching disabled")
+    redis_client = None
+
+def pdf_cache_key(estimate):
+    """Cache key for a rendered PDF, derived from the estimate content."""
+    doc = {k: v for k, v in estimate.items() if k != '_id'}
+    canonical = json_util.dumps(doc, sort_keys=True)
+    return "pdf:" + hashlib.sha256(canonical.encode()).hexdigest()
+
+# The cache is best-effort: a Redis outage must never fail the request,
+# so every cache operation swallows errors and falls through
+
+async def pdf_cache_get(key):
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        print(f"Warning: Redis unavailable, skipping PDF cache read: {e}")
+        return None
+
+async def pdf_cache_set(key, pdf_bytes):
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, PDF_CACHE_TTL, pdf_bytes)
+    except Exception as e:
+        print(f"Warning: Redis unavailable, skipping PDF cache write: {e}")
+
+async def pdf_cache_invalidate(estimate):
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(pdf_cache_key(estimate))
+    except Exception as e:
+        # Stale entries are bounded by PDF_CACHE_TTL anyway
+        print(f"Warning: Redis unavailable, skipping PDF cache invalidation: {e}")
+
+def content_etag(payload):
+    """Weak-validator ETag for a JSON-serializable payload.
+
+    Weak (W/) because the hash covers the semantic content, not the exact
+    response bytes — which is all a revalidating poll needs.
+    """
+    return 'W/"' + hashlib.md5(orjson.dumps(payload, default=str)).hexdigest() + '"'
+
+# PDF layout constants. The estimate template is fixed, so the PDF is drawn
+# directly on a canvas instead of going through Platypus flowable layout;
+# HexColor parses its argument with a regex, so keep the palette as
+# singletons, and the column geometry never changes either
+_COLOR_HEADER = colors.HexColor('#1a365d')
+_COLOR_ALT_ROW = colors.HexColor('#f7fafc')
+_COLOR_TOTAL_ROW = colors.HexColor('#edf2f7')
+
+_MAIN_COL_WIDTHS = (0.5*inch, 3*inch, 1*inch, 0.8*inch, 1.2*inch, 1.5*inch)
+_COL_ALIGNMENTS = ('CENTER', 'LEFT', 'RIGHT', 'RIGHT', 'RIGHT', 'RIGHT')
+_TABLE_HEADERS = ('Sn', 'Particulars', 'Qty', 'Unit', 'Rate (₹)', 'Amount (₹)')
+
+_PAGE_WIDTH, _PAGE_HEIGHT = A4
+_TABLE_WIDTH = sum(_MAIN_COL_WIDTHS)
+_TABLE_X = (_PAGE_WIDTH - _TABLE_WIDTH) / 2
+_ROW_HEIGHT = 18
+_HEADER_ROW_HEIGHT = 24
+_PAGE_BOTTOM_MARGIN = 72
+
+def _draw_page_header(c):
+    """Draw the company letterhead; returns the y below it."""
+    y = _PAGE_HEIGHT - 60
+    c.setFillColor(_COLOR_HEADER)
+    c.setFont('Helvetica-Bold', 24)
+    c.drawCentredString(_PAGE_WIDTH / 2, y, "HAVN CUBE")
+    y -= 24
+    c.setFillColor(colors.black)
+    c.setFont('Helvetica', 14)
+    c.drawCentredString(_PAGE_WIDTH / 2, y, "Interior Design & Execution")
+    y -= 18
+    c.drawCentredString(_PAGE_WIDTH / 2, y, "Contact: +91-XXXXXXXXXX | Email: info@havncube.com")
+    return y - 30
+
+def _draw_info_block(c, estimate, y):
+    """Draw the estimate/client details; returns the y below them."""
+    c.setFillColor(colors.black)
+    c.setFont('Helvetica', 10)
+    c.drawString(_TABLE_X, y, f"Estimate No: {estimate.get('estimate_number', '')}")
+    c.drawString(_TABLE_X + 3*inch, y, f"Date: {estimate.get('date', '')}")
+    for line in (
+        f"Client: {estimate.get('client_name', '')}",
+        f"Address: {estimate.get('client_address', '')}",
+        f"Phone: {estimate.get('client_phone', '')}",
+    ):
+        y -= 14
+        c.drawString(_TABLE_X, y, line)
+    return y - 24
+
+def _draw_table_row(c, y, cells, font='Helvetica', size=9, bg=None, text_color=colors.black):
+    """Draw one gridded table row with y as its top edge; returns the new y."""
+    height = _HEADER_ROW_HEIGHT if bg is _COLOR_HEADER else _ROW_HEIGHT
+    bottom = y - height
+    if bg is not None:
+        c.setFillColor(bg)
+        c.rect(_TABLE_X, bottom, _TABLE_WIDTH, height, stroke=0, fill=1)
+    c.setFillColor(text_color)
+    c.setFont(font, size)
+    baseline = bottom + (height - size) / 2 + 1
+    x = _TABLE_X
+    for cell, width, align in zip(cells, _MAIN_COL_WIDTHS, _COL_ALIGNMENTS):
+        if cell:
+            if align == 'LEFT':
+                c.drawString(x + 4, baseline, cell)
+            elif align == 'CENTER':
+                c.drawCentredString(x + width / 2, baseline, cell)
+            else:
+                c.drawRightString(x + width - 4, baseline, cell)
+        x += width
+    # Grid: row outline plus the inner column separators
+    c.setStrokeColor(colors.black)
+    c.rect(_TABLE_X, bottom, _TABLE_WIDTH, height, stroke=1, fill=0)
+    x = _TABLE_X
+    for width in _MAIN_COL_WIDTHS[:-1]:
+        x += width
+        c.line(x, bottom, x, y)
+    return bottom
+
+def _draw_table_header(c, y):
+    return _draw_table_row(c, y, _TABLE_HEADERS, font='Helvetica-Bold', size=10,
+                           bg=_COLOR_HEADER, text_color=colors.whitesmoke)
+
+# Canvas rendering in _build_pdf is CPU-bound; run it off the event loop
+# so PDF requests don't stall the other handlers
+_PDF_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
 
 # Pydantic models
 class LineItem(BaseModel):
-    id: str = ""
+    # uuid7 is time-ordered, so ids insert into the Mongo B-tree without
+    # page splits
+    id: str = Field(default_factory=lambda: uuid7().hex)
     particulars: str
     length_feet: Optional[int] = 0
     length_inches: Optional[int] = 0
@@ -59,6 +238,13 @@ class LineItem(BaseModel):
     rate: float = 0
     amount: float = 0
 
+    @field_validator('id', mode='before')
+    @classmethod
+    def _default_empty_id(cls, value):
+        # The frontend sends id: "" for new line items, which bypasses
+        # default_factory (it only fires when the field is absent)
+        return value or uuid7().hex
+
 class EstimateRequest(BaseModel):
     client_name: str
     client_address: str = ""
@@ -86,6 +272,52 @@ class EstimateResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+def recompute_totals(estimate: EstimateRequest):
+    """Fill derived line-item quantity/amount and the estimate totals.
+
+    Runs once on every write so the stored document is authoritative and
+    the PDF renderer never has to re-derive measurements.
+    """
+    subtotal = 0.0
+    for item in estimate.line_items:
+        if item.unit == 'SQFT' and (item.length_feet or 0) > 0:
+            length = (item.length_feet or 0) + (item.length_inches or 0) / 12
+            width = (item.width_feet or 0) + (item.width_inches or 0) / 12
+            item.quantity = round(length * width, 2)
+        item.amount = round(item.quantity * item.rate, 2)
+        subtotal += item.amount
+    estimate.subtotal = round(subtotal, 2)
+    estimate.tax_amount = round(subtotal * estimate.tax_rate / 100, 2)
+    estimate.total_amount = round(estimate.subtotal + estimate.tax_amount, 2)
+
+@app.on_event("startup")
+async def prepare_database():
+    if estimates_collection is None:
+        return
+    # Warm the connection pool so the first request doesn't pay
+    # lazy-connection latency
+    await db.command("ping")
+    # Point lookups on id and the created_at sort in get_estimates both
+    # need indexes to avoid collection scans / in-memory sorts
+    await estimates_collection.create_index("id", unique=True)
+    await estimates_collection.create_index([("created_at", -1)])
+    # Seed the estimate counter from numbers issued before the counter
+    # existed, so numbering on an existing deployment never restarts at
+    # HCE-0001 and collides with already-issued estimates
+    if await counters_collection.find_one({"_id": "estimate"}) is None:
+        max_seq = 0
+        cursor = estimates_collection.find(
+            {"estimate_number": {"$regex": r"^HCE-\d+$"}},
+            projection={"_id": 0, "estimate_number": 1}
+        )
+        async for doc in cursor:
+            max_seq = max(max_seq, int(doc["estimate_number"][4:]))
+        await counters_collection.update_one(
+            {"_id": "estimate"},
+            {"$setOnInsert": {"seq": max_seq}},
+            upsert=True
+        )
+
 @app.get("/")
 async def root():
     return {"message": "Havn Cube Billing & Estimation API"}
@@ -100,19 +332,22 @@ async def create_estimate(estimate: EstimateRequest):
         raise HTTPException(status_code=500, detail="Database not connected")
     
     # Generate ID and timestamps
-    estimate_id = str(uuid.uuid4())
+    estimate_id = uuid7().hex
     now = datetime.utcnow()
     
-    # Generate estimate number if not provided
+    # Generate estimate number if not provided (atomic counter, safe under
+    # concurrent inserts and avoids a full-collection count)
     if not estimate.estimate_number:
-        count = await estimates_collection.count_documents({})
-        estimate.estimate_number = f"HCE-{count + 1:04d}"
-    
-    # Add IDs to line items
-    for item in estimate.line_items:
-        if not item.id:
-            item.id = str(uuid.uuid4())
-    
+        counter = await counters_collection.find_one_and_update(
+            {"_id": "estimate"},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        estimate.estimate_number = f"HCE-{counter['seq']:04d}"
+
+    recompute_totals(estimate)
+
     estimate_data = {
         "id": estimate_id,
         **estimate.model_dump(),
@@ -124,214 +359,208 @@ async def create_estimate(estimate: EstimateRequest):
     
     return EstimateResponse(**estimate_data)
 
-@app.get("/api/estimates", response_model=List[EstimateResponse])
-async def get_estimates():
+@app.post("/api/estimates/bulk", status_code=201)
+async def create_estimates_bulk(estimates: List[EstimateRequest]):
     if estimates_collection is None:
         raise HTTPException(status_code=500, detail="Database not connected")
-    
-    estimates = []
-    async for estimate in estimates_collection.find().sort("created_at", -1):
-        estimates.append(EstimateResponse(**estimate))
-    
-    return estimates
 
-@app.get("/api/estimates/{estimate_id}", response_model=EstimateResponse)
-async def get_estimate(estimate_id: str):
+    if not estimates:
+        return []
+
+    now = datetime.utcnow()
+
+    # Reserve the whole estimate-number range with one counter $inc
+    missing = sum(1 for estimate in estimates if not estimate.estimate_number)
+    if missing:
+        counter = await counters_collection.find_one_and_update(
+            {"_id": "estimate"},
+            {"$inc": {"seq": missing}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        next_seq = counter['seq'] - missing + 1
+
+    prepared = []
+    for estimate in estimates:
+        if not estimate.estimate_number:
+            estimate.estimate_number = f"HCE-{next_seq:04d}"
+            next_seq += 1
+        recompute_totals(estimate)
+        prepared.append({
+            "id": uuid7().hex,
+            **estimate.model_dump(),
+            "created_at": now,
+            "updated_at": now
+        })
+
+    # Copy before bulk_write: InsertOne mutates the documents by adding
+    # the driver-generated _id; raw dicts go straight to ORJSONResponse
+    responses = [doc.copy() for doc in prepared]
+
+    # Single round trip for the whole batch; unordered lets Mongo
+    # parallelize the inserts
+    await estimates_collection.bulk_write([InsertOne(doc) for doc in prepared], ordered=False)
+
+    return responses
+
+# Reads return the Motor dicts as-is: the data was validated on write,
+# so re-running it through EstimateResponse is a wasted round trip and
+# ORJSONResponse serializes the raw documents (datetimes included)
+@app.get("/api/estimates")
+async def get_estimates(request: Request, response: Response,
+                        skip: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=200)):
+    if estimates_collection is None:
+        raise HTTPException(status_code=500, detail="Database not connected")
+
+    # Pull documents in driver-sized batches and skip per-doc validation:
+    # the data came out of our own writes, so model_construct is safe
+    cursor = estimates_collection.find({}, projection={"_id": 0}).sort("created_at", -1).skip(skip).limit(limit).batch_size(200)
+    docs = await cursor.to_list(length=limit)
+
+    # Unchanged polls short-circuit to an empty 304; hashing the page's
+    # (id, updated_at) pairs tracks every change that alters the page,
+    # including a delete whose slot backfills from beyond the limit
+    etag = content_etag([[doc['id'], doc['updated_at']] for doc in docs])
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return docs
+
+@app.get("/api/estimates/{estimate_id}")
+async def get_estimate(estimate_id: str, request: Request, response: Response):
     if estimates_collection is None:
         raise HTTPException(status_code=500, detail="Database not connected")
     
-    estimate = await estimates_collection.find_one({"id": estimate_id})
+    estimate = await estimates_collection.find_one({"id": estimate_id}, projection={"_id": 0})
     if not estimate:
         raise HTTPException(status_code=404, detail="Estimate not found")
-    
-    return EstimateResponse(**estimate)
 
-@app.put("/api/estimates/{estimate_id}", response_model=EstimateResponse)
+    etag = content_etag(estimate)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return estimate
+
+@app.put("/api/estimates/{estimate_id}")
 async def update_estimate(estimate_id: str, estimate: EstimateRequest):
     if estimates_collection is None:
         raise HTTPException(status_code=500, detail="Database not connected")
     
-    existing = await estimates_collection.find_one({"id": estimate_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Estimate not found")
-    
-    # Add IDs to line items if missing
-    for item in estimate.line_items:
-        if not item.id:
-            item.id = str(uuid.uuid4())
-    
+    recompute_totals(estimate)
+
     update_data = {
         **estimate.model_dump(),
         "updated_at": datetime.utcnow()
     }
-    
-    await estimates_collection.update_one(
+
+    # Single round trip: the pre-update document covers the 404 check and
+    # PDF cache invalidation, and the response is assembled locally
+    previous = await estimates_collection.find_one_and_update(
         {"id": estimate_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"_id": 0}
     )
-    
-    updated_estimate = await estimates_collection.find_one({"id": estimate_id})
-    return EstimateResponse(**updated_estimate)
+    if previous is None:
+        raise HTTPException(status_code=404, detail="Estimate not found")
+
+    # Drop any PDF cached for the previous content
+    await pdf_cache_invalidate(previous)
+
+    # Raw dict return, like the read endpoints: the input was validated on
+    # the way in and ORJSONResponse serializes it without a Pydantic detour
+    return {**previous, **update_data}
 
 @app.delete("/api/estimates/{estimate_id}")
 async def delete_estimate(estimate_id: str):
     if estimates_collection is None:
         raise HTTPException(status_code=500, detail="Database not connected")
     
-    result = await estimates_collection.delete_one({"id": estimate_id})
-    if result.deleted_count == 0:
+    existing = await estimates_collection.find_one({"id": estimate_id}, projection={"_id": 0})
+    if not existing:
         raise HTTPException(status_code=404, detail="Estimate not found")
-    
+
+    await estimates_collection.delete_one({"id": estimate_id})
+
+    # Drop any PDF cached for the deleted estimate
+    await pdf_cache_invalidate(existing)
+
     return {"message": "Estimate deleted successfully"}
 
+def _build_pdf(estimate):
+    """Render an estimate to PDF bytes (sync, runs in _PDF_POOL)."""
+    buf = io.BytesIO()
+    c = pdf_canvas.Canvas(buf, pagesize=A4)
+
+    y = _draw_page_header(c)
+    y = _draw_info_block(c, estimate, y)
+    y = _draw_table_header(c, y)
+
+    # quantity/amount are computed on write, so render the stored values;
+    # model_construct swaps the per-row dict.get grind for attribute access
+    # and fills defaults without validation
+    items = [LineItem.model_construct(**raw) for raw in estimate.get('line_items', [])]
+    rows = [
+        (str(i), item.particulars, f"{item.quantity:.2f}", item.unit,
+         f"₹{item.rate:,.2f}", f"₹{item.amount:,.2f}")
+        for i, item in enumerate(items, 1)
+    ]
+    for i, row in enumerate(rows, 1):
+        if y - _ROW_HEIGHT < _PAGE_BOTTOM_MARGIN:
+            c.showPage()
+            y = _draw_table_header(c, _PAGE_HEIGHT - 60)
+        y = _draw_table_row(c, y, row, bg=colors.white if i % 2 else _COLOR_ALT_ROW)
+
+    # Subtotal, tax, and total rows
+    totals = (
+        ('Subtotal:', estimate.get('subtotal', 0), None),
+        (f"Tax ({estimate.get('tax_rate', 18)}%):", estimate.get('tax_amount', 0), None),
+        ('Total:', estimate.get('total_amount', 0), _COLOR_TOTAL_ROW),
+    )
+    for label, value, bg in totals:
+        if y - _ROW_HEIGHT < _PAGE_BOTTOM_MARGIN:
+            c.showPage()
+            y = _PAGE_HEIGHT - 60
+        y = _draw_table_row(c, y, ('', '', '', '', label, f"₹{value:,.2f}"),
+                            font='Helvetica-Bold', size=10, bg=bg)
+
+    # Footer
+    if y - 60 < _PAGE_BOTTOM_MARGIN:
+        c.showPage()
+        y = _PAGE_HEIGHT - 60
+    c.setFillColor(colors.grey)
+    c.setFont('Helvetica', 10)
+    c.drawCentredString(_PAGE_WIDTH / 2, y - 40, "Thank you for choosing Havn Cube!")
+    c.drawCentredString(_PAGE_WIDTH / 2, y - 54, "This estimate is valid for 30 days.")
+
+    c.save()
+    return buf.getvalue()
+
 @app.post("/api/estimates/{estimate_id}/pdf")
 async def generate_pdf(estimate_id: str):
     if estimates_collection is None:
         raise HTTPException(status_code=500, detail="Database not connected")
-    
-    estimate = await estimates_collection.find_one({"id": estimate_id})
+
+    estimate = await estimates_collection.find_one({"id": estimate_id}, projection={"_id": 0})
     if not estimate:
         raise HTTPException(status_code=404, detail="Estimate not found")
-    
-    # Create temporary PDF file
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    
-    try:
-        # Create PDF document
-        doc = SimpleDocTemplate(temp_file.name, pagesize=A4)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=styles['Title'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a365d'),
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
-        
-        company_style = ParagraphStyle(
-            'CompanyStyle',
-            parent=styles['Normal'],
-            fontSize=14,
-            alignment=TA_CENTER,
-            spaceAfter=10
-        )
-        
-        # Header
-        story.append(Paragraph("HAVN CUBE", title_style))
-        story.append(Paragraph("Interior Design & Execution", company_style))
-        story.append(Paragraph("Contact: +91-XXXXXXXXXX | Email: info@havncube.com", company_style))
-        story.append(Spacer(1, 20))
-        
-        # Estimate details
-        estimate_info = [
-            [f"Estimate No: {estimate.get('estimate_number', '')}", f"Date: {estimate.get('date', '')}"],
-            [f"Client: {estimate.get('client_name', '')}", ""],
-            [f"Address: {estimate.get('client_address', '')}", ""],
-            [f"Phone: {estimate.get('client_phone', '')}", ""]
-        ]
-        
-        info_table = Table(estimate_info, colWidths=[3*inch, 3*inch])
-        info_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        
-        story.append(info_table)
-        story.append(Spacer(1, 20))
-        
-        # Line items table
-        table_data = [['Sn', 'Particulars', 'Qty', 'Unit', 'Rate (₹)', 'Amount (₹)']]
-        
-        for i, item in enumerate(estimate.get('line_items', []), 1):
-            qty_display = item.get('quantity', 0)
-            if item.get('unit') == 'SQFT' and item.get('length_feet', 0) > 0:
-                length = item.get('length_feet', 0) + (item.get('length_inches', 0) / 12)
-                width = item.get('width_feet', 0) + (item.get('width_inches', 0) / 12)
-                qty_display = round(length * width, 2)
-            
-            table_data.append([
-                str(i),
-                item.get('particulars', ''),
-                f"{qty_display:.2f}",
-                item.get('unit', ''),
-                f"₹{item.get('rate', 0):,.2f}",
-                f"₹{item.get('amount', 0):,.2f}"
-            ])
-        
-        # Add subtotal, tax, and total
-        subtotal = estimate.get('subtotal', 0)
-        tax_amount = estimate.get('tax_amount', 0)
-        total = estimate.get('total_amount', 0)
-        
-        table_data.extend([
-            ['', '', '', '', 'Subtotal:', f"₹{subtotal:,.2f}"],
-            ['', '', '', '', f"Tax ({estimate.get('tax_rate', 18)}%):", f"₹{tax_amount:,.2f}"],
-            ['', '', '', '', 'Total:', f"₹{total:,.2f}"]
-        ])
-        
-        # Create table
-        main_table = Table(table_data, colWidths=[0.5*inch, 3*inch, 1*inch, 0.8*inch, 1.2*inch, 1.5*inch])
-        main_table.setStyle(TableStyle([
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a365d')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            
-            # Data styling
-            ('FONTNAME', (0, 1), (-1, -4), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -4), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -4), [colors.white, colors.HexColor('#f7fafc')]),
-            ('GRID', (0, 0), (-1, -4), 1, colors.black),
-            
-            # Totals styling
-            ('FONTNAME', (0, -3), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, -3), (-1, -1), 10),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#edf2f7')),
-            ('GRID', (0, -3), (-1, -1), 1, colors.black),
-            
-            # Alignment
-            ('ALIGN', (1, 1), (1, -4), 'LEFT'),  # Particulars left aligned
-            ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),  # Numbers right aligned
-        ]))
-        
-        story.append(main_table)
-        story.append(Spacer(1, 30))
-        
-        # Footer
-        footer_style = ParagraphStyle(
-            'FooterStyle',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            textColor=colors.grey
-        )
-        
-        story.append(Paragraph("Thank you for choosing Havn Cube!", footer_style))
-        story.append(Paragraph("This estimate is valid for 30 days.", footer_style))
-        
-        # Build PDF
-        doc.build(story)
-        
-        return FileResponse(
-            temp_file.name,
-            media_type='application/pdf',
-            filename=f"Estimate_{estimate.get('estimate_number', estimate_id)}.pdf"
-        )
-        
-    except Exception as e:
-        # Clean up temp file on error
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
-        raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
+
+    headers = {'Content-Disposition': f"attachment; filename=\"Estimate_{estimate.get('estimate_number', estimate_id)}.pdf\""}
+
+    # Serve a previously rendered PDF if the estimate content hasn't changed
+    cache_key = pdf_cache_key(estimate)
+    cached = await pdf_cache_get(cache_key)
+    if cached:
+        return Response(cached, media_type='application/pdf', headers=headers)
+
+    # Render off the event loop so concurrent handlers keep running
+    loop = asyncio.get_running_loop()
+    pdf_bytes = await loop.run_in_executor(_PDF_POOL, _build_pdf, estimate)
+
+    await pdf_cache_set(cache_key, pdf_bytes)
+
+    return Response(pdf_bytes, media_type='application/pdf', headers=headers)
 
 if __name__ == "__main__":
     import uvicorn
@@ -10,10 +10,12 @@ class HavnCubeAPITester:
         self.tests_passed = 0
         self.created_estimate_id = None
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, response_type='json'):
+    def run_test(self, name, method, endpoint, expected_status, data=None, response_type='json', headers=None):
         """Run a single API test"""
         url = f"{self.base_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
+        request_headers = {'Content-Type': 'application/json'}
+        if headers:
+            request_headers.update(headers)
 
         self.tests_run += 1
         print(f"\n🔍 Testing {name}...")
@@ -21,13 +23,13 @@ class HavnCubeAPITester:
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers)
+                response = requests.get(url, headers=request_headers)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
+                response = requests.post(url, json=data, headers=request_headers)
             elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers)
+                response = requests.put(url, json=data, headers=request_headers)
             elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
+                response = requests.delete(url, headers=request_headers)
 
             success = response.status_code == expected_status
             if success:
@@ -115,6 +117,50 @@ class HavnCubeAPITester:
         
         return success, response
 
+    def test_bulk_create_estimates(self):
+        """Test creating several estimates in one bulk request"""
+        bulk_data = [
+            {
+                "client_name": f"Bulk Test Client {i+1}",
+                "client_address": "Bulk Test Address",
+                "client_phone": "+91-1234567890",
+                "date": datetime.now().strftime("%Y-%m-%d"),
+                "line_items": [
+                    {
+                        "particulars": f"Bulk Item {i+1}",
+                        "length_feet": 10,
+                        "length_inches": 0,
+                        "width_feet": 10,
+                        "width_inches": 0,
+                        "quantity": 0,
+                        "unit": "SQFT",
+                        "rate": 100.0,
+                        "amount": 0
+                    }
+                ],
+                "tax_rate": 18.0,
+                "subtotal": 0,
+                "tax_amount": 0,
+                "total_amount": 0
+            }
+            for i in range(3)
+        ]
+
+        success, response = self.run_test("Bulk Create Estimates", "POST", "api/estimates/bulk", 201, bulk_data)
+        if success and isinstance(response, list):
+            print(f"   Created {len(response)} estimates in one request")
+            numbers = [est.get('estimate_number', '') for est in response]
+            print(f"   Estimate numbers: {numbers}")
+            if len(set(numbers)) != len(numbers):
+                print("   ⚠️  Duplicate estimate numbers in bulk response")
+
+            # Clean up bulk test estimates
+            for est in response:
+                if 'id' in est:
+                    requests.delete(f"{self.base_url}/api/estimates/{est['id']}")
+
+        return success, response
+
     def test_get_estimates(self):
         """Test getting all estimates"""
         success, response = self.run_test("Get All Estimates", "GET", "api/estimates", 200)
@@ -122,6 +168,31 @@ class HavnCubeAPITester:
             print(f"   Found {len(response)} estimates")
         return success, response
 
+    def test_list_pagination_validation(self):
+        """Test skip/limit validation on the list endpoint"""
+        self.run_test("List Rejects Negative Skip", "GET", "api/estimates?skip=-1", 422)
+        self.run_test("List Rejects Zero Limit", "GET", "api/estimates?limit=0", 422)
+        return self.run_test("List Rejects Oversized Limit", "GET", "api/estimates?limit=100000000", 422)
+
+    def test_conditional_get(self):
+        """Test ETag / If-None-Match replay on the list endpoint"""
+        first = requests.get(f"{self.base_url}/api/estimates")
+        etag = first.headers.get('ETag')
+        if first.status_code != 200 or not etag:
+            self.tests_run += 1
+            print("\n🔍 Testing Conditional GET Replay...")
+            print(f"❌ Failed - No ETag on list response (status {first.status_code})")
+            return False, {}
+
+        print(f"   List ETag: {etag}")
+        return self.run_test(
+            "Conditional GET Replay",
+            "GET",
+            "api/estimates",
+            304,
+            headers={'If-None-Match': etag}
+        )
+
     def test_get_single_estimate(self):
         """Test getting a single estimate by ID"""
         if not self.created_estimate_id:
@@ -289,7 +360,10 @@ def main():
         tester.test_root_endpoint,
         tester.test_health_check,
         tester.test_create_estimate,
+        tester.test_bulk_create_estimates,
         tester.test_get_estimates,
+        tester.test_list_pagination_validation,
+        tester.test_conditional_get,
         tester.test_get_single_estimate,
         tester.test_update_estimate,
         tester.test_generate_pdf,